@@ -0,0 +1,78 @@
+# benchmarks/bench_job_dedup.py
+#
+# Ingests synthetic job postings (with near-duplicate reposts) through the
+# MinHash/LSH deduplicator and reports throughput and duplicate recall.
+#
+#   python benchmarks/bench_job_dedup.py --postings 1000000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from modules.job_dedup import DEFAULT_THRESHOLD, JobDeduplicator, job_text  # noqa: E402
+
+ROLES = ["Frontend Engineer", "Data Analyst", "Backend Developer", "Product Designer", "DevOps Engineer", "ML Engineer"]
+SKILLS = ["React", "Python", "SQL", "Figma", "Kubernetes", "AWS", "Go", "TypeScript", "Spark", "Docker", "Agile", "Tableau"]
+FILLER = ["team", "product", "customers", "scale", "build", "ship", "remote", "hybrid", "growth", "mentor", "own", "design"]
+
+
+def make_posting(rng, i):
+    words = rng.choices(SKILLS + FILLER, k=40)
+    return {
+        "title": f"{rng.choice(ROLES)} {i}",
+        "company": f"Company {rng.randrange(50_000)}",
+        "description": " ".join(words),
+    }
+
+
+def repost(rng, job):
+    """A copy as another board would list it: different casing and one word changed."""
+    words = job["description"].split()
+    words[rng.randrange(len(words))] = rng.choice(FILLER)
+    return dict(job, title=job["title"].upper(), description=" ".join(words))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--postings", type=int, default=1_000_000)
+    parser.add_argument("--dup-rate", type=float, default=0.3, help="fraction of postings that are reposts")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    dedup = JobDeduplicator(threshold=args.threshold)
+    originals = []
+    reposts = caught = false_merges = 0
+
+    start = time.perf_counter()
+    for i in range(args.postings):
+        if originals and rng.random() < args.dup_rate:
+            job, is_repost = repost(rng, rng.choice(originals)), True
+        else:
+            job, is_repost = make_posting(rng, i), False
+        duplicate_of = dedup.add(job_text(job))
+        if is_repost:
+            reposts += 1
+            caught += duplicate_of is not None
+        elif duplicate_of is None:
+            originals.append(job)
+        else:
+            false_merges += 1  # a fresh posting collapsed into an unrelated one
+        if (i + 1) % 100_000 == 0:
+            print(f"{i + 1:>9} postings  {(i + 1) / (time.perf_counter() - start):,.0f}/s", flush=True)
+    elapsed = time.perf_counter() - start
+
+    print(f"bands x rows:    {dedup.bands} x {dedup.rows} (threshold {args.threshold})")
+    print(f"postings:        {args.postings:,} in {elapsed:.1f}s ({args.postings / elapsed:,.0f}/s)")
+    print(f"unique kept:     {len(dedup):,}")
+    print(f"repost recall:   {caught / max(reposts, 1):.3f} ({caught:,}/{reposts:,})")
+    print(f"dup-flagged originals: {false_merges:,} of {args.postings - reposts:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import datetime
 from streamlit_option_menu import option_menu
 from streamlit_lottie import st_lottie
 import requests
+from modules.session import begin_session, end_session, ensure_session
 
 # --- 1. APP CONFIGURATION ---
 st.set_page_config(
@@ -61,7 +62,7 @@ def login_ui():
             if st.form_submit_button("Secure Login", use_container_width=True, type="primary"):
                 try:
                     user = auth.sign_in_with_email_and_password(email, password)
-                    st.session_state["user"] = user
+                    begin_session(db, user)
                     st.rerun()
                 except Exception:
                     st.error("❌ Invalid email or password.")
@@ -74,7 +75,7 @@ def login_ui():
             if st.form_submit_button("Create My Account", use_container_width=True):
                 try:
                     user = auth.create_user_with_email_and_password(email, password)
-                    st.session_state["user"] = user
+                    begin_session(db, user)
                     uid = user['localId']
                     db.collection("users").document(uid).set({"email": email, "joined": datetime.datetime.now(datetime.timezone.utc)})
                     st.success("✅ Account created! Welcome aboard.")
@@ -113,7 +114,7 @@ def launch_app():
             }
         )
         if st.button("🚪 Logout", use_container_width=True):
-            st.session_state.clear()
+            end_session(db)
             st.rerun()
 
     # --- Page Routing ---
@@ -134,10 +135,8 @@ def launch_app():
         st.success("✨ **New Opportunity Found:** A 'Senior Python Developer' role at **TechCorp** just opened up. It's a 92% match with your profile. [View Details](#)")
 
     elif page == "Resume Editor":
-        st.title("✍️ Interactive Resume Editor")
-        st.info("This is where the live resume editor with real-time AI feedback will be built using streamlit-ace.")
-        # from modules.resume_editor import live_resume_editor
-        # live_resume_editor(uid, db)
+        from modules.resume_editor import live_resume_editor
+        live_resume_editor(uid, db)
 
     elif page == "Job Discovery":
         st.title("🛰️ Proactive Job Discovery Engine")
@@ -165,7 +164,7 @@ def launch_app():
             st.error("🔒 You do not have permission to access this page.")
 
 # --- App Start Point ---
-if "user" not in st.session_state:
+if ensure_session(db, firebase_config["apiKey"]) is None:
     login_ui()
 else:
     launch_app()
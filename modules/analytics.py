@@ -1,6 +1,139 @@
+import json
+import os
+import shutil
+import time
+from collections import Counter
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- Snapshot settings ---
+PAGE_SIZE = 500  # users per Firestore page and per Parquet part file
+SNAPSHOT_DIR = os.path.join(".cache", "admin_users")
+SNAPSHOT_TTL_SECONDS = 6 * 60 * 60
+# Kept inside the snapshot so a rebuild removes an export of the old data.
+EXPORT_PATH = os.path.join(SNAPSHOT_DIR, "export.parquet")
+# st.download_button holds the whole file in server memory while it is offered,
+# so larger exports are only written to disk for copying off the server.
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+
+USER_SCHEMA = pa.schema([
+    ("uid", pa.string()),
+    ("email", pa.string()),
+    ("joined", pa.timestamp("us", tz="UTC")),
+    ("apps_tracked", pa.int64()),
+])
+
+
+def _manifest_path():
+    return os.path.join(SNAPSHOT_DIR, "manifest.json")
+
+
+def _part_path(index):
+    return os.path.join(SNAPSHOT_DIR, f"part-{index:05d}.parquet")
+
+
+def load_manifest():
+    try:
+        with open(_manifest_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_manifest(manifest):
+    tmp = _manifest_path() + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, _manifest_path())
+
+
+def count_jobs_per_user(db):
+    """Counts tracked jobs for every user with one keys-only collection-group scan."""
+    counts = Counter()
+    for job in db.collection_group("jobs").select([]).stream():
+        counts[job.reference.parent.parent.id] += 1
+    return counts
+
+
+def fetch_user_page(db, cursor=None, limit=PAGE_SIZE):
+    """Returns up to `limit` user documents ordered by uid, starting after `cursor`."""
+    query = db.collection("users").order_by("__name__").limit(limit)
+    if cursor:
+        query = query.start_after({"__name__": cursor})
+    return list(query.stream())
+
+
+def _to_timestamp(value):
+    """Firestore timestamps pass through; legacy strings are parsed, unparseable ones become null."""
+    if value is None:
+        return None
+    ts = pd.to_datetime(value, utc=True, errors="coerce")
+    return None if pd.isna(ts) else ts.to_pydatetime()
+
+
+def _page_to_table(docs, job_counts):
+    rows = {"uid": [], "email": [], "joined": [], "apps_tracked": []}
+    for doc in docs:
+        data = doc.to_dict() or {}
+        rows["uid"].append(doc.id)
+        rows["email"].append(data.get("email"))
+        rows["joined"].append(_to_timestamp(data.get("joined")))
+        rows["apps_tracked"].append(job_counts.get(doc.id, 0))
+    return pa.Table.from_pydict(rows, schema=USER_SCHEMA)
+
+
+def build_snapshot(db, restart=False):
+    """Pages through Firestore into Parquet part files under `SNAPSHOT_DIR`.
+
+    The manifest is rewritten after every page, so a build interrupted by a
+    rerun continues from its cursor instead of starting over.
+    """
+    manifest = None if restart else load_manifest()
+    if manifest is None or manifest.get("complete"):
+        shutil.rmtree(SNAPSHOT_DIR, ignore_errors=True)
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        manifest = {"parts": 0, "rows": 0, "cursor": None, "complete": False, "started": time.time()}
+        _save_manifest(manifest)
+
+    job_counts = count_jobs_per_user(db)
+    progress = st.progress(0.0, text="Loading users...")
+    while True:
+        docs = fetch_user_page(db, manifest["cursor"])
+        if docs:
+            pq.write_table(_page_to_table(docs, job_counts), _part_path(manifest["parts"]))
+            manifest.update(parts=manifest["parts"] + 1, rows=manifest["rows"] + len(docs), cursor=docs[-1].id)
+        if len(docs) < PAGE_SIZE:
+            manifest.update(complete=True, finished=time.time())
+        _save_manifest(manifest)
+        progress.progress(1.0 if manifest["complete"] else min(0.95, manifest["parts"] / 100),
+                          text=f"Loaded {manifest['rows']} users...")
+        if manifest["complete"]:
+            break
+    progress.empty()
+    return manifest
+
+
+def read_snapshot(columns=None):
+    """Reads selected columns across all part files without loading the rest."""
+    parts = [_part_path(i) for i in range(load_manifest()["parts"])]
+    if not parts:
+        return USER_SCHEMA.empty_table().select(columns or USER_SCHEMA.names)
+    return pa.concat_tables(pq.read_table(p, columns=columns) for p in parts)
+
+
+def export_snapshot(path=EXPORT_PATH):
+    """Streams every part into a single Parquet file, one row group per part."""
+    tmp = path + ".tmp"  # an interrupted export never replaces a finished one
+    with pq.ParquetWriter(tmp, USER_SCHEMA) as writer:
+        for i in range(load_manifest()["parts"]):
+            writer.write_table(pq.read_table(_part_path(i)))
+    os.replace(tmp, path)
+    return path
+
 
 def admin_analytics(db):
     """Displays an admin dashboard with platform usage analytics."""
@@ -8,54 +141,60 @@ def admin_analytics(db):
     st.markdown("Track platform usage and key performance metrics.")
 
     try:
-        users_ref = db.collection("users").stream()
-        users_list = []
-
-        for user in users_ref:
-            user_data = user.to_dict()
-            user_data['uid'] = user.id
-            users_list.append(user_data)
+        manifest = load_manifest()
+        stale = (
+            manifest is None
+            or not manifest.get("complete")
+            or time.time() - manifest.get("finished", 0) > SNAPSHOT_TTL_SECONDS
+        )
+        if st.button("🔄 Refresh Snapshot"):
+            manifest = build_snapshot(db, restart=True)
+        elif stale:
+            manifest = build_snapshot(db)
 
-        if not users_list:
+        if not manifest["rows"]:
             st.info("No user data found.")
             return
 
-        df_users = pd.DataFrame(users_list)
-
-        # Fallback for 'joined' missing
-        if 'joined' not in df_users.columns:
-            df_users['joined'] = pd.to_datetime("today")
-
-        df_users['last_active'] = pd.to_datetime(df_users['joined']).dt.date
-        df_users['apps_tracked'] = [
-            len(list(db.collection('users').document(uid).collection('jobs').stream()))
-            for uid in df_users['uid']
-        ]
-
-        active_today = df_users[df_users["last_active"] == pd.to_datetime("today").date()].shape[0]
-        total_users = len(df_users)
-        total_applications = df_users["apps_tracked"].sum()
+        stats = read_snapshot(columns=["joined", "apps_tracked"]).to_pandas()
+        active_today = (stats["joined"].dt.date == pd.Timestamp.now(tz="UTC").date()).sum()
+        total_users = manifest["rows"]
+        total_applications = int(stats["apps_tracked"].sum())
 
         col1, col2, col3 = st.columns(3)
         col1.metric("Total Users", f"{total_users} 👥")
         col2.metric("Active Today", f"{active_today} 🔥")
         col3.metric("Total Jobs Tracked", f"{total_applications} 📄")
+        st.caption(f"Snapshot taken {pd.Timestamp(manifest['finished'], unit='s'):%Y-%m-%d %H:%M} UTC")
 
         st.divider()
         st.subheader("📊 User Engagement Overview")
 
-        fig = px.bar(
-            df_users,
-            x="uid",
-            y="apps_tracked",
-            labels={"uid": "User ID", "apps_tracked": "Tracked Jobs"},
-            title="📈 Jobs Tracked Per User",
+        fig = px.histogram(
+            stats,
+            x="apps_tracked",
+            nbins=30,
+            labels={"apps_tracked": "Tracked Jobs", "count": "Users"},
+            title="📈 Distribution of Jobs Tracked Per User",
             color_discrete_sequence=["#636AF2"]
         )
         st.plotly_chart(fig, use_container_width=True)
 
         st.subheader("🧾 Raw User Data")
-        st.dataframe(df_users)
+        page = st.number_input("Page", min_value=1, max_value=manifest["parts"], value=1, step=1)
+        st.dataframe(pq.read_table(_part_path(page - 1)).to_pandas())
+        st.caption(f"Page {page} of {manifest['parts']} · {PAGE_SIZE} users per page")
+
+        if st.button("📦 Prepare Parquet Export"):
+            with st.spinner("Writing export..."):
+                export_snapshot()
+        if os.path.exists(EXPORT_PATH):
+            if os.path.getsize(EXPORT_PATH) > MAX_DOWNLOAD_BYTES:
+                st.info(f"📦 Export is too large to download here; copy `{os.path.abspath(EXPORT_PATH)}` from the server.")
+            else:
+                with open(EXPORT_PATH, "rb") as f:
+                    st.download_button("⬇️ Download Users (.parquet)", data=f, file_name="users.parquet",
+                                       mime="application/vnd.apache.parquet")
 
     except Exception as e:
         st.error(f"⚠️ Could not load analytics: {e}")
@@ -1,6 +1,9 @@
 import streamlit as st
 import google.generativeai as genai
-import fitz  # PyMuPDF
+from modules.resume_parser import load_resume
+from modules.task_runner import DONE, FAILED, CANCELLED, generate_text, poll_task, submit_task
+
+ATS_SECTIONS = {"summary", "experience", "education", "skills", "projects", "certifications"}
 
 def ats_cv_optimizer():
     """Analyzes a resume against a job description for ATS keyword optimization."""
@@ -26,23 +29,12 @@ def ats_cv_optimizer():
             return
 
         with st.spinner("🔍 Running AI-powered analysis..."):
-            resume_text = ""
-
-            # Handle resume parsing
-            if resume_file.type == "application/pdf":
-                try:
-                    doc = fitz.open(stream=resume_file.read(), filetype="pdf")
-                    for page in doc:
-                        resume_text += page.get_text()
-                except Exception as e:
-                    st.error(f"❌ PDF Parsing Failed: {e}")
-                    return
-            else:
-                try:
-                    resume_text = resume_file.read().decode("utf-8")
-                except Exception as e:
-                    st.error(f"❌ Text File Reading Failed: {e}")
-                    return
+            # Only the sections keywords can land in; contact details, references etc. are left out.
+            try:
+                resume_text = load_resume(resume_file).to_prompt_text(ATS_SECTIONS)
+            except Exception as e:
+                st.error(f"❌ Resume Parsing Failed: {e}")
+                return
 
             prompt = f"""
             You are an expert in resume optimization and ATS systems.
@@ -63,9 +55,14 @@ def ats_cv_optimizer():
             Format your output in **markdown**, with clear headings.
             """
 
-            try:
-                response = model.generate_content(prompt)
-                st.subheader("✅ ATS Optimization Suggestions")
-                st.markdown(response.text)
-            except Exception as e:
-                st.error(f"❌ Gemini analysis failed: {e}")
+            submit_task("ats_cv_optimizer", prompt, generate_text, model, prompt)
+
+    # --- Result (survives reruns and page switches) ---
+    task = poll_task("ats_cv_optimizer", label="🔍 Running AI-powered analysis in the background...")
+    if task and task["status"] == DONE:
+        st.subheader("✅ ATS Optimization Suggestions")
+        st.markdown(task["result"])
+    elif task and task["status"] == FAILED:
+        st.error(f"❌ Gemini analysis failed: {task['error']}")
+    elif task and task["status"] == CANCELLED:
+        st.warning("✋ Analysis cancelled.")
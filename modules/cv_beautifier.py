@@ -1,25 +1,41 @@
+import html
+
 import streamlit as st
 
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    from PyMuPDF import fitz
-
-def extract_text_from_pdf(uploaded_file):
-    try:
-        with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            return text
-    except Exception as e:
-        st.error(f"Failed to extract text: {e}")
-        return None
+from modules.resume_parser import HEADER_KEY, StructuredResume, parse_resume_pdf, parse_resume_text
+
+@st.cache_data(show_spinner=False)
+def render_section_html(section):
+    """Renders one serialized section; unchanged sections reuse their cached fragment."""
+    parts = []
+    if section["key"] != HEADER_KEY:
+        parts.append(
+            f"<h4 style='margin: 18px 0 6px; border-bottom: 1px solid #636AF2; padding-bottom: 4px'>{html.escape(section['title'])}</h4>"
+        )
+
+    bullets = []
+    for entry in section["entries"]:
+        if entry["bullet"]:
+            bullets.append(f"<li>{html.escape(entry['text'])}</li>")
+            continue
+        if bullets:
+            parts.append(f"<ul style='margin: 4px 0 8px 18px'>{''.join(bullets)}</ul>")
+            bullets = []
+        text = html.escape(entry["text"])
+        for date in entry["dates"]:
+            text = text.replace(html.escape(date), f"<span style='float: right; color: #888'>{html.escape(date)}</span>", 1)
+        weight = "600" if section["key"] == HEADER_KEY and not parts else "normal"
+        parts.append(f"<div style='font-weight: {weight}'>{text}</div>")
+    if bullets:
+        parts.append(f"<ul style='margin: 4px 0 8px 18px'>{''.join(bullets)}</ul>")
+    return "".join(parts)
+
+def render_resume_html(resume):
+    sections = "".join(render_section_html(section) for section in resume.to_dict()["sections"])
+    return f"<div style='font-family: Inter, sans-serif; font-size: 14px; line-height: 1.6'>{sections}</div>"
 
 def format_cv_text(text):
-    # You can add better formatting logic here if needed
-    formatted = text.replace("\n", "<br>")
-    return f"<div style='font-family: Inter, sans-serif; font-size: 14px; line-height: 1.6'>{formatted}</div>"
+    return render_resume_html(StructuredResume.from_dict(parse_resume_text(text)))
 
 def beautify_cv_ui():
     st.subheader("🧾 CV Beautifier")
@@ -28,10 +44,15 @@ def beautify_cv_ui():
     uploaded_file = st.file_uploader("Upload your CV (PDF only)", type=["pdf"])
 
     if uploaded_file is not None:
-        text = extract_text_from_pdf(uploaded_file)
-        if text:
-            st.success("✅ CV text extracted successfully.")
+        try:
+            resume = StructuredResume.from_dict(parse_resume_pdf(uploaded_file.getvalue()))
+        except Exception as e:
+            st.error(f"Failed to extract text: {e}")
+            return
+
+        if resume.sections:
+            st.success(f"✅ CV parsed into {len(resume.sections)} sections.")
             with st.container():
                 st.markdown("---")
                 st.markdown("### 🖋️ Formatted Resume Preview:")
-                st.markdown(format_cv_text(text), unsafe_allow_html=True)
+                st.markdown(render_resume_html(resume), unsafe_allow_html=True)
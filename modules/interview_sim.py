@@ -1,7 +1,104 @@
+import datetime
+
 import streamlit as st
 import google.generativeai as genai
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore import Client, Query
+
+# --- Transcript settings ---
+WINDOW_SIZE = 10          # most recent messages kept in session, rendered and sent to Gemini
+EARLIER_PAGE_SIZE = 20    # older messages fetched per "Show earlier messages" click
+HISTORY_PAGE_SIZE = 10    # past interviews listed per "Load more" click
+
+
+def _interviews_ref(db, uid):
+    return db.collection("users").document(uid).collection("interviews")
+
+
+def start_interview(db, uid, role, job_title):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    _, ref = _interviews_ref(db, uid).add({
+        "role": role,
+        "job_title": job_title,
+        "started": now,
+        "updated": now,
+        "turns": 0,
+    })
+    return ref.id
+
+
+def append_message(db, uid, interview_id, seq, role, content):
+    """Appends one message; existing messages are never rewritten.
+
+    Raises `AlreadyExists` if `seq` is taken, e.g. by another tab on the same interview.
+    """
+    interview_ref = _interviews_ref(db, uid).document(interview_id)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    batch = db.batch()
+    batch.create(interview_ref.collection("messages").document(f"{seq:06d}"),
+                 {"seq": seq, "role": role, "content": content, "created": now})
+    batch.update(interview_ref, {"turns": seq + 1, "updated": now})
+    batch.commit()
+
+
+def load_messages(db, uid, interview_id, start, end):
+    """Returns messages with `start <= seq < end`, oldest first."""
+    query = (
+        _interviews_ref(db, uid).document(interview_id).collection("messages")
+        .where("seq", ">=", max(start, 0)).where("seq", "<", end).order_by("seq")
+    )
+    return [doc.to_dict() for doc in query.stream()]
+
+
+def list_interviews(db, uid, limit, after=None):
+    """Most recently updated interviews first, continuing after the `after` interview if given."""
+    query = _interviews_ref(db, uid).order_by("updated", direction=Query.DESCENDING).limit(limit)
+    if after:
+        query = query.start_after({"updated": after["updated"]})
+    return [dict(doc.to_dict(), id=doc.id) for doc in query.stream()]
+
+
+def _open_interview(db, uid, interview_id):
+    # The stored count, not a listed one: the list may predate turns taken since.
+    turns = _interviews_ref(db, uid).document(interview_id).get().to_dict()["turns"]
+    st.session_state.interview_id = interview_id
+    st.session_state.interview_turns = turns
+    st.session_state.interview_window = load_messages(db, uid, interview_id, turns - WINDOW_SIZE, turns)
+    st.session_state.interview_earlier = []  # older pages, only once the user asks for them
 
-def run_interview_simulator():
+
+def _forget_past_interviews():
+    st.session_state.pop("interview_past", None)
+    st.session_state.pop("interview_past_exhausted", None)
+
+
+def _record(db, uid, role, content):
+    """Appends a message; returns False, reloaded, if another tab got there first."""
+    seq = st.session_state.interview_turns
+    try:
+        append_message(db, uid, st.session_state.interview_id, seq, role, content)
+    except AlreadyExists:
+        _open_interview(db, uid, st.session_state.interview_id)
+        st.session_state.interview_notice = "⚠️ This interview was continued elsewhere, so the latest messages were reloaded. Please resend."
+        return False
+    _forget_past_interviews()  # listed message counts and order are now stale
+    st.session_state.interview_turns = seq + 1
+    window = st.session_state.interview_window
+    window.append({"seq": seq, "role": role, "content": content})
+    if st.session_state.interview_earlier:
+        # Keep already-shown history contiguous as messages slide out of the window.
+        st.session_state.interview_earlier.extend(window[:-WINDOW_SIZE])
+    del window[:-WINDOW_SIZE]
+    return True
+
+
+def _load_past_page(db, uid, past):
+    page = list_interviews(db, uid, HISTORY_PAGE_SIZE, after=past[-1] if past else None)
+    st.session_state.interview_past = past + page
+    st.session_state.interview_past_exhausted = len(page) < HISTORY_PAGE_SIZE
+
+
+def run_interview_simulator(uid: str, db: Client):
     """A realistic AI-powered mock interview with a Gemini chat interface."""
     st.title("🎤 AI Mock Interview Simulator")
     st.markdown("Prepare for your dream role with AI-driven mock interviews.")
@@ -18,33 +115,70 @@ def run_interview_simulator():
     role = col1.selectbox("👔 Interviewer Persona", ["HR Manager", "Tech Lead", "Startup Founder", "Product Manager"])
     job_title = col2.text_input("💼 Job Title You're Applying For", placeholder="e.g., Backend Engineer")
 
-    # --- Chat History Setup ---
-    if "interview_history" not in st.session_state:
-        st.session_state.interview_history = []
+    # --- Past Interviews (queried only when asked for, then kept in session) ---
+    with st.expander("🗂️ Past Interviews"):
+        past = st.session_state.get("interview_past")
+        if past is None:
+            if st.button("📂 Load past interviews"):
+                _load_past_page(db, uid, [])
+                st.rerun()
+        else:
+            if not past:
+                st.caption("No saved interviews yet.")
+            for interview in past:
+                label = f"{interview['job_title'] or 'Interview'} · {interview['role']} · {interview['turns']} messages"
+                if st.button(label, key=f"open_{interview['id']}", use_container_width=True):
+                    _open_interview(db, uid, interview["id"])
+                    st.rerun()
+            if not st.session_state.get("interview_past_exhausted") and st.button("⬇️ Load more"):
+                _load_past_page(db, uid, past)
+                st.rerun()
 
     # --- Start New Interview ---
     if st.button("🎬 Start New Interview"):
-        st.session_state.interview_history = []
+        interview_id = start_interview(db, uid, role, job_title)
+        _open_interview(db, uid, interview_id)
+        _forget_past_interviews()  # relist with the new interview next time
         intro_prompt = f"You are a {role} conducting a professional mock interview for a {job_title} role. Begin the interview with your first question."
         with st.spinner("AI Interviewer is preparing..."):
             response = model.generate_content(intro_prompt)
-            st.session_state.interview_history.append({"role": "assistant", "content": response.text})
+            _record(db, uid, "assistant", response.text)
         st.rerun()
 
+    if "interview_id" not in st.session_state:
+        return
+
+    if notice := st.session_state.pop("interview_notice", None):
+        st.warning(notice)
+
+    # --- Earlier Messages (fetched once per click, then kept in session) ---
+    window = st.session_state.interview_window
+    earlier = st.session_state.interview_earlier
+    oldest_shown = earlier or window
+    shown_from = oldest_shown[0]["seq"] if oldest_shown else st.session_state.interview_turns
+    if shown_from > 0 and st.button("⬆️ Show earlier messages"):
+        page = load_messages(db, uid, st.session_state.interview_id, shown_from - EARLIER_PAGE_SIZE, shown_from)
+        st.session_state.interview_earlier = page + earlier
+        st.rerun()
+    for msg in earlier:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+
     # --- Display Chat ---
-    for msg in st.session_state.interview_history:
+    for msg in window:
         with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
 
     # --- User Reply ---
     if prompt := st.chat_input("Type your answer..."):
-        st.session_state.interview_history.append({"role": "user", "content": prompt})
+        if not _record(db, uid, "user", prompt):
+            st.rerun()
         with st.chat_message("user"):
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
-                chat_context = "\n".join([f"{m['role']}: {m['content']}" for m in st.session_state.interview_history])
+                chat_context = "\n".join([f"{m['role']}: {m['content']}" for m in st.session_state.interview_window])
                 follow_up_prompt = f"This is a mock interview. Based on the conversation so far, ask the next best interview question.\n\n{chat_context}"
                 try:
                     reply = model.generate_content(follow_up_prompt)
@@ -54,4 +188,5 @@ def run_interview_simulator():
 
                 st.markdown(response_text)
 
-        st.session_state.interview_history.append({"role": "assistant", "content": response_text})
+        if not _record(db, uid, "assistant", response_text):
+            st.rerun()
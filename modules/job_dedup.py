@@ -0,0 +1,100 @@
+# modules/job_dedup.py
+
+import re
+import zlib
+
+import numpy as np
+
+# --- Dedup settings ---
+DEFAULT_THRESHOLD = 0.8   # estimated Jaccard similarity above which two postings are the same job
+NUM_PERM = 128
+SHINGLE_SIZE = 3          # word n-grams
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Word n-grams of the normalized text; short texts fall back to single words."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < size:
+        return set(words)
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def job_text(job):
+    return f"{job.get('title', '')} {job.get('company', '')} {job.get('description', '')}"
+
+
+def choose_bands(num_perm, threshold):
+    """Picks (bands, rows) whose LSH S-curve crosses 50% just below `threshold`.
+
+    Erring low keeps recall high; the extra candidates are filtered out by the
+    signature comparison in `JobDeduplicator.add`. Thresholds below every
+    crossing point get the most bands, the split with the best recall.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"threshold must be in (0, 1], got {threshold!r}")
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    below = [br for br in options if (1 / br[0]) ** (1 / br[1]) <= threshold]
+    return max(below, key=lambda br: (1 / br[0]) ** (1 / br[1])) if below else options[-1]
+
+
+class JobDeduplicator:
+    """Collapses near-duplicate postings with MinHash signatures bucketed by LSH.
+
+    Each added posting is compared only against postings that share at least
+    one band bucket, so ingestion cost stays roughly constant as the index
+    grows instead of scanning every earlier posting.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        rng = np.random.default_rng(seed)
+        # a < 2**31 and hashes < 2**32 keep a * x + b inside uint64.
+        self._a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = []
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def signature(self, text):
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)  # halves index memory
+
+    def _band_keys(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, text):
+        """Indexes `text` if new and returns None; otherwise returns the index of the kept posting it duplicates."""
+        sig = self.signature(text)
+        keys = self._band_keys(sig)
+
+        candidates = set()
+        for bucket, key in zip(self._buckets, keys):
+            candidates.update(bucket.get(key, ()))
+        for idx in sorted(candidates):
+            if np.count_nonzero(self._signatures[idx] == sig) / self.num_perm >= self.threshold:
+                return idx
+
+        idx = len(self._signatures)
+        self._signatures.append(sig)
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(idx)
+        return None
+
+
+def dedupe_jobs(jobs, threshold=DEFAULT_THRESHOLD):
+    """Returns `jobs` with near-duplicates removed, keeping the first of each group."""
+    dedup = JobDeduplicator(threshold=threshold)
+    return [job for job in jobs if dedup.add(job_text(job)) is None]
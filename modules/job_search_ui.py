@@ -2,6 +2,7 @@ import streamlit as st
 import google.generativeai as genai
 import requests
 from bs4 import BeautifulSoup
+from modules.job_dedup import DEFAULT_THRESHOLD, dedupe_jobs
 
 def job_search_ui():
     st.title("🔍 AI-Powered Job Discovery")
@@ -47,12 +48,16 @@ def job_search_ui():
                     }
                 ]
 
+                # Collapse the same posting listed on several boards before ranking
+                threshold = float(st.secrets.get("JOB_DEDUP_THRESHOLD", DEFAULT_THRESHOLD))
+                jobs = dedupe_jobs(mock_jobs, threshold=threshold)
+
                 # Gemini prompt: Match jobs to skills
                 skill_prompt = f"""
 You are a career advisor. Given the candidate's desired job role: "{role}", location: "{location}", and skills: {skills},
 analyze the following jobs and rank the top 3 matches with explanation:
 
-{mock_jobs}
+{jobs}
                 """
 
                 response = model.generate_content(skill_prompt).text
@@ -2,14 +2,80 @@
 
 import streamlit as st
 import datetime
+import hashlib
+import threading
 from google.cloud.firestore import Client
 from google.generativeai import GenerativeModel
 import google.generativeai as genai
+from modules.task_runner import generate_text, get_prefetch_registry
 
 # Setup Gemini
 genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
 model = genai.GenerativeModel("gemini-pro")
 
+# Suggestions shared by every user tracking the same role, company, location and stage
+SUGGESTIONS_COLLECTION = "job_suggestions"
+
+# Fixed pool picked by key hash, so the lock count never grows with the number of keys
+_KEY_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _key_lock(key):
+    return _KEY_LOCKS[int(key, 16) % len(_KEY_LOCKS)]
+
+
+def suggestion_prompt(job):
+    return f"""
+    I'm applying for a job titled '{job['title']}' at '{job['company']}' in location '{job.get('location', '')}'.
+    Suggest a better job title or a way to improve my positioning. Also give one interview question to prepare for this stage: {job['stage']}.
+    """
+
+
+def suggestion_key(job):
+    """The prompt depends only on these fields, so jobs that share them share a suggestion."""
+    parts = [str(job.get(field, "")).strip().lower() for field in ("title", "company", "location", "stage")]
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def shared_suggestion(db, key, prompt):
+    """Returns the shared suggestion for `key`, generating and storing it if missing.
+
+    Callers for the same key wait on one lock, so concurrent jobs across users
+    make a single Gemini call; the Firestore copy covers other server processes.
+    Must not touch `st.*`: it also runs on the prefetch pool.
+    """
+    shared_ref = db.collection(SUGGESTIONS_COLLECTION).document(key)
+    with _key_lock(key):
+        snapshot = shared_ref.get()
+        if snapshot.exists:
+            return snapshot.to_dict()["text"]
+        text = generate_text(model, prompt)
+        shared_ref.set({"text": text, "created": datetime.datetime.now().isoformat()})
+        return text
+
+
+def fetch_suggestion(db, key, prompt, job_ref):
+    """Stores the shared suggestion for `key` on one job document and returns it."""
+    text = shared_suggestion(db, key, prompt)
+    job_ref.update({"ai_suggestion": {"key": key, "text": text}})
+    return text
+
+
+def prefetch_suggestion(db, job_ref, job):
+    """Queues a low-priority suggestion for `job`.
+
+    The Gemini call is shared by key across users; the write to this job's
+    document is its own task and always runs, so a second user tracking the
+    same role, or a job moved back to an earlier stage, gets the stored answer.
+    """
+    key = suggestion_key(job)
+    get_prefetch_registry().submit(
+        "shared", "job_suggestion", f"{job_ref.path}:{key}",
+        fetch_suggestion, db, key, suggestion_prompt(job), job_ref,
+        reuse_finished=False,
+    )
+
+
 def job_tracker_pro(uid: str, db: Client):
     st.title("🗂️ Smart Kanban Job Tracker + Gemini AI")
 
@@ -42,6 +108,7 @@ def job_tracker_pro(uid: str, db: Client):
                     new_stage = st.selectbox("Move to", stages, index=stages.index(stage), key=f"stage_{job['id']}")
                     if new_stage != job["stage"]:
                         user_jobs_ref.document(job["id"]).update({"stage": new_stage})
+                        prefetch_suggestion(db, user_jobs_ref.document(job["id"]), dict(job, stage=new_stage))
                         st.success("✅ Stage updated")
                         st.experimental_rerun()
 
@@ -53,25 +120,29 @@ def job_tracker_pro(uid: str, db: Client):
                         new_date = st.date_input("Applied Date", value=datetime.date.fromisoformat(job["applied_date"]), key=f"date_{job['id']}")
 
                         if st.button("💾 Save", key=f"save_{job['id']}"):
-                            user_jobs_ref.document(job["id"]).update({
+                            updates = {
                                 "title": new_title,
                                 "company": new_company,
                                 "location": new_location,
                                 "applied_date": new_date.strftime("%Y-%m-%d")
-                            })
+                            }
+                            user_jobs_ref.document(job["id"]).update(updates)
+                            prefetch_suggestion(db, user_jobs_ref.document(job["id"]), dict(job, **updates))
                             st.success("✅ Job updated")
                             st.experimental_rerun()
 
                     # 🤖 Gemini Suggestions
                     if st.button("🤖 Suggest Improvements", key=f"suggest_{job['id']}"):
-                        with st.spinner("Gemini is thinking..."):
-                            prompt = f"""
-                            I'm applying for a job titled '{job['title']}' at '{job['company']}' in location '{job['location']}'.
-                            Suggest a better job title or a way to improve my positioning. Also give one interview question to prepare for this stage: {job['stage']}.
-                            """
-                            response = model.generate_content(prompt)
-                            st.markdown("#### 💡 Gemini Suggestions:")
-                            st.info(response.text)
+                        key = suggestion_key(job)
+                        stored = job.get("ai_suggestion") or {}
+                        if stored.get("key") == key:
+                            text = stored["text"]
+                        else:
+                            # Not prefetched for this job yet: reuse another user's copy or generate it now.
+                            with st.spinner("Gemini is thinking..."):
+                                text = fetch_suggestion(db, key, suggestion_prompt(job), user_jobs_ref.document(job["id"]))
+                        st.markdown("#### 💡 Gemini Suggestions:")
+                        st.info(text)
 
                     # 🗑️ Delete
                     if st.button("❌ Delete", key=f"delete_{job['id']}"):
@@ -100,6 +171,7 @@ def job_tracker_pro(uid: str, db: Client):
                 "status": "Pending",
                 "created_at": datetime.datetime.now().isoformat()
             }
-            user_jobs_ref.add(job_data)
+            _, job_ref = user_jobs_ref.add(job_data)
+            prefetch_suggestion(db, job_ref, job_data)
             st.success("✅ Job added")
             st.experimental_rerun()
@@ -2,7 +2,11 @@
 
 import streamlit as st
 import google.generativeai as genai
-import fitz  # PyMuPDF
+from modules.resume_parser import load_resume
+from modules.task_runner import DONE, FAILED, CANCELLED, generate_text, poll_task, submit_task
+
+# Sections that never affect the review are left out of the prompt.
+SKIPPED_SECTIONS = {"interests", "references"}
 
 def resume_ai_suite(uid, db, storage):
     st.title("📤 Resume Optimizer + Gemini AI")
@@ -26,13 +30,7 @@ def resume_ai_suite(uid, db, storage):
     if resume_file:
         st.markdown("✅ **Resume Uploaded:** Previewing content...")
         try:
-            if resume_file.type == "application/pdf":
-                doc = fitz.open(stream=resume_file.read(), filetype="pdf")
-                for i, page in enumerate(doc):
-                    resume_text += page.get_text()
-                    if i > 2: break  # Only preview first 3 pages
-            else:
-                resume_text = resume_file.read().decode("utf-8")
+            resume_text = load_resume(resume_file).to_prompt_text(exclude=SKIPPED_SECTIONS)
             st.code(resume_text[:1000] + "...", language="markdown")
         except Exception as e:
             st.error(f"❌ Error reading resume file: {e}")
@@ -43,8 +41,7 @@ def resume_ai_suite(uid, db, storage):
             st.warning("⚠️ Please upload a resume and job description.")
             return
 
-        with st.spinner("Analyzing your resume with AI..."):
-            prompt = f"""
+        prompt = f"""
             Act as a senior career coach and ATS expert.
             Analyze the resume below against the job description and respond in Markdown format with 3 structured sections:
 
@@ -64,19 +61,22 @@ def resume_ai_suite(uid, db, storage):
             --- Job Description ---
             {job_desc}
             """
-
-            try:
-                response = model.generate_content(prompt)
-                st.success("✅ AI Review Complete")
-
-                # Display using tabs
-                tabs = st.tabs(["🖋 Formatting", "🔑 Keyword Match", "💥 Bullet Point Upgrade"])
-                content = response.text
-
-                for i, section in enumerate(["First Impressions", "Keyword", "Bullet"]):
-                    with tabs[i]:
-                        section_text = content.split("###")[i + 1] if f"### {section}" in content else content
-                        st.markdown("### " + section_text.strip())
-
-            except Exception as e:
-                st.error(f"⚠️ AI failed to analyze resume: {e}")
+        submit_task("resume_ai_suite", prompt, generate_text, model, prompt)
+
+    # --- Result (survives reruns and page switches) ---
+    task = poll_task("resume_ai_suite", label="Analyzing your resume with AI in the background...")
+    if task and task["status"] == DONE:
+        st.success("✅ AI Review Complete")
+
+        # Display using tabs
+        tabs = st.tabs(["🖋 Formatting", "🔑 Keyword Match", "💥 Bullet Point Upgrade"])
+        content = task["result"]
+
+        for i, section in enumerate(["First Impressions", "Keyword", "Bullet"]):
+            with tabs[i]:
+                section_text = content.split("###")[i + 1] if f"### {section}" in content else content
+                st.markdown("### " + section_text.strip())
+    elif task and task["status"] == FAILED:
+        st.error(f"⚠️ AI failed to analyze resume: {task['error']}")
+    elif task and task["status"] == CANCELLED:
+        st.warning("✋ Analysis cancelled.")
@@ -0,0 +1,168 @@
+# modules/resume_editor.py
+
+import hashlib
+import time
+
+import streamlit as st
+import google.generativeai as genai
+from google.cloud.firestore import Client
+from streamlit_ace import st_ace
+
+from modules.resume_parser import HEADER_KEY, StructuredResume, parse_resume_text
+from modules.task_runner import CANCELLED, DONE, FAILED, generate_text, get_task_registry, task_owner
+
+# --- Editor settings ---
+DEBOUNCE_SECONDS = 2.0       # wait this long after the last edit before analyzing
+POLL_INTERVAL_SECONDS = 1.0
+
+
+def split_sections(text):
+    """Splits a draft into (key, title, body) tuples; repeated keys get a numeric suffix."""
+    resume = StructuredResume.from_dict(parse_resume_text(text))
+    seen = {}
+    sections = []
+    for section in resume.sections:
+        seen[section.key] = seen.get(section.key, 0) + 1
+        key = section.key if seen[section.key] == 1 else f"{section.key}_{seen[section.key]}"
+        sections.append((key, section.title or "Header", section.text()))
+    return sections
+
+
+def section_hash(title, body, target_role):
+    return hashlib.sha256(f"{target_role}\x00{title}\x00{body}".encode("utf-8")).hexdigest()[:32]
+
+
+def section_prompt(title, body, target_role):
+    return f"""
+    You are a senior career coach reviewing ONE section of a resume for a {target_role or "general"} role.
+
+    --- {title} ---
+    {body}
+
+    Give 2–4 short, specific suggestions for this section only (wording, impact, metrics, keywords).
+    Respond in concise **markdown** bullets.
+    """
+
+
+def update_feedback(feedback, sections, target_role, submit):
+    """Re-analyzes only sections whose hash changed and returns how many were submitted.
+
+    `feedback` maps section key -> {"hash", "title", "task_id", "text", "error"} and is
+    updated in place; sections that disappeared from the draft are dropped.
+    `submit(hash, prompt)` queues the analysis and returns a task ID.
+    """
+    keys = {key for key, _, _ in sections}
+    for key in list(feedback):
+        if key not in keys:
+            del feedback[key]
+
+    submitted = 0
+    for key, title, body in sections:
+        if key == HEADER_KEY:
+            continue  # name and contact details need no feedback
+        digest = section_hash(title, body, target_role)
+        if feedback.get(key, {}).get("hash") == digest:
+            continue
+        feedback[key] = {
+            "hash": digest,
+            "title": title,
+            "task_id": submit(digest, section_prompt(title, body, target_role)),
+            "text": None,
+            "error": None,
+        }
+        submitted += 1
+    return submitted
+
+
+def collect_feedback(feedback, get_task):
+    """Fills in finished results. Returns True while any section is still being analyzed."""
+    pending = False
+    for entry in feedback.values():
+        if entry["text"] is not None or entry["error"] is not None:
+            continue
+        task = get_task(entry["task_id"])
+        if task is None or task["status"] in (FAILED, CANCELLED):
+            entry["error"] = (task and task["error"]) or "Analysis stopped, edit the section to retry."
+        elif task["status"] == DONE:
+            entry["text"] = task["result"]
+        else:
+            pending = True
+    return pending
+
+
+def live_resume_editor(uid: str, db: Client):
+    st.title("✍️ Interactive Resume Editor")
+    st.markdown("Write or paste your resume. Only the sections you change are re-analyzed, so feedback stays fast as you type.")
+
+    try:
+        genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+        model = genai.GenerativeModel("gemini-pro")
+    except Exception:
+        st.error("❌ Gemini API key missing or misconfigured.")
+        return
+
+    draft_ref = db.collection("users").document(uid).collection("resume").document("draft")
+    if "editor_text" not in st.session_state:
+        draft = draft_ref.get()
+        st.session_state.editor_text = draft.to_dict().get("text", "") if draft.exists else ""
+        st.session_state.editor_initial_text = st.session_state.editor_text
+        st.session_state.editor_saved_text = st.session_state.editor_text
+        st.session_state.editor_last_edit = 0.0
+        st.session_state.editor_feedback = {}
+
+    target_role = st.text_input("🎯 Target Role", placeholder="e.g., Data Analyst")
+
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        text = st_ace(
+            value=st.session_state.editor_initial_text,  # a changing value would reset the cursor
+            language="markdown",
+            theme="tomorrow_night",
+            wrap=True,
+            auto_update=True,
+            height=600,
+            key="resume_editor_ace",
+        )
+
+    if text is not None and text != st.session_state.editor_text:
+        st.session_state.editor_text = text
+        st.session_state.editor_last_edit = time.time()
+
+    # --- Debounce: analyze once the draft has settled ---
+    waiting = time.time() - st.session_state.editor_last_edit
+    settled = waiting >= DEBOUNCE_SECONDS
+    registry = get_task_registry()
+    owner = task_owner()
+    feedback = st.session_state.editor_feedback
+
+    if settled:
+        if st.session_state.editor_text != st.session_state.editor_saved_text:
+            draft_ref.set({"text": st.session_state.editor_text})
+            st.session_state.editor_saved_text = st.session_state.editor_text
+        update_feedback(
+            feedback,
+            split_sections(st.session_state.editor_text),
+            target_role,
+            lambda digest, prompt: registry.submit(owner, "resume_editor", digest, generate_text, model, prompt),
+        )
+    pending = collect_feedback(feedback, lambda task_id: registry.get(owner, task_id))
+
+    with col2:
+        st.subheader("💡 Section Feedback")
+        if not feedback:
+            st.caption("Start typing — feedback appears per section a moment after you pause.")
+        for key, entry in feedback.items():
+            with st.expander(entry["title"], expanded=True):
+                if entry["text"] is not None:
+                    st.markdown(entry["text"])
+                elif entry["error"] is not None:
+                    st.error(f"⚠️ {entry['error']}")
+                else:
+                    st.caption("⏳ Analyzing...")
+
+    if not settled:
+        time.sleep(DEBOUNCE_SECONDS - waiting)
+        st.rerun()
+    if pending:
+        time.sleep(POLL_INTERVAL_SECONDS)
+        st.rerun()
@@ -0,0 +1,247 @@
+# modules/resume_parser.py
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+import streamlit as st
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    from PyMuPDF import fitz
+
+# --- Section detection ---
+SECTION_ALIASES = {
+    "summary": ("summary", "profile", "professional summary", "objective", "career objective", "about me"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "employment history", "work history"),
+    "education": ("education", "academic background", "qualifications"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "technologies", "tools"),
+    "projects": ("projects", "personal projects", "academic projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "awards": ("awards", "achievements", "honors", "honours"),
+    "publications": ("publications", "research"),
+    "languages": ("languages",),
+    "volunteering": ("volunteering", "volunteer experience", "leadership"),
+    "interests": ("interests", "hobbies"),
+    "references": ("references",),
+}
+_ALIAS_TO_KEY = {alias: key for key, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+HEADER_KEY = "header"  # name/contact block before the first heading
+BULLET_CHARS = "•▪●◦‣∙·-–*"
+_BOLD_FLAG = 16  # PyMuPDF span flag bit for bold text
+
+_DATE_RE = re.compile(
+    r"\b(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?(?:19|20)\d{2}"
+    r"(?:\s*(?:-|–|—|to)\s*(?:(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?(?:19|20)\d{2}|present|current|now))?",
+    re.IGNORECASE,
+)
+
+
+@dataclass(slots=True)
+class Entry:
+    """One line or bullet of a resume section, with any dates found in it."""
+    text: str
+    bullet: bool = False
+    dates: tuple = ()
+
+
+@dataclass(slots=True)
+class Section:
+    key: str
+    title: str
+    entries: list = field(default_factory=list)
+
+    def text(self):
+        return "\n".join(f"- {e.text}" if e.bullet else e.text for e in self.entries)
+
+
+@dataclass(slots=True)
+class StructuredResume:
+    """Resume split into sections, bullets and dates.
+
+    Built once per document (see `parse_resume_pdf` / `parse_resume_text`) and
+    passed around in its `to_dict` form so Streamlit can cache it.
+    """
+    sections: list = field(default_factory=list)
+
+    def section(self, key):
+        return next((s for s in self.sections if s.key == key), None)
+
+    def to_prompt_text(self, keys=None, exclude=()):
+        """Compact text for Gemini prompts, limited to `keys` and skipping `exclude`.
+
+        Sections under custom headings (keys outside `SECTION_ALIASES`) are
+        always kept, since there is no telling what they hold. Falls back to
+        every section if nothing matched, so an unusual layout never produces
+        an empty prompt.
+        """
+        sections = [
+            s for s in self.sections
+            if (keys is None or s.key in keys or (s.key not in SECTION_ALIASES and s.key != HEADER_KEY))
+            and s.key not in exclude
+        ]
+        if not sections:
+            sections = self.sections
+        return "\n\n".join(f"## {s.title}\n{s.text()}" if s.title else s.text() for s in sections if s.entries)
+
+    def to_dict(self):
+        return {
+            "sections": [
+                {
+                    "key": s.key,
+                    "title": s.title,
+                    "entries": [{"text": e.text, "bullet": e.bullet, "dates": list(e.dates)} for e in s.entries],
+                }
+                for s in self.sections
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(sections=[
+            Section(
+                key=s["key"],
+                title=s["title"],
+                entries=[Entry(text=e["text"], bullet=e["bullet"], dates=tuple(e["dates"])) for e in s["entries"]],
+            )
+            for s in data.get("sections", [])
+        ])
+
+
+def _section_key(line):
+    normalized = re.sub(r"[^a-z ]", "", line.lower()).strip()
+    return _ALIAS_TO_KEY.get(normalized)
+
+
+def _looks_like_heading(text, size=None, body_size=None, bold=False):
+    """Known section names are headings; otherwise only the PDF font can say so.
+
+    Capitals alone are not enough: acronyms ("AWS, GCP, SQL") and school or
+    company names are often written in caps.
+    """
+    if len(text) > 40 or len(text.split()) > 5 or _DATE_RE.search(text):
+        return False
+    if _section_key(text):
+        return True
+    if size is None or body_size is None:
+        return False
+    return size >= body_size + 1.5 or (bold and (size > body_size or text.isupper()))
+
+
+def _split_bullet(text):
+    stripped = text.lstrip()
+    if stripped and stripped[0] in BULLET_CHARS and (len(stripped) == 1 or stripped[1] == " "):
+        return True, stripped[1:].strip()
+    return False, stripped
+
+
+class _Builder:
+    """Accumulates lines into sections and entries while parsing."""
+
+    def __init__(self):
+        self.resume = StructuredResume(sections=[Section(key=HEADER_KEY, title="")])
+        self.heading_text = None  # raw text of the last heading, to demote it if it stays empty
+        self.pending_bullet = False
+
+    def _demote_empty_heading(self):
+        """Turns a heading with nothing under it back into a line of the section before it."""
+        sections = self.resume.sections
+        if len(sections) > 1 and not sections[-1].entries:
+            sections.pop()
+            self.line(self.heading_text)
+        self.heading_text = None
+
+    def heading(self, text):
+        self._demote_empty_heading()
+        key = _section_key(text)
+        if not key and len(self.resume.sections) == 1 and not self.resume.sections[0].entries:
+            # Large or bold text at the very top is the candidate's name.
+            self.line(text)
+            return
+        key = key or re.sub(r"[^a-z]+", "_", text.lower()).strip("_")
+        self.resume.sections.append(Section(key=key, title=text.strip().title() if text.isupper() else text.strip()))
+        self.heading_text = text
+        self.pending_bullet = False
+
+    def line(self, text, continues=False):
+        bullet, text = _split_bullet(text)
+        if not text:
+            # A bullet glyph on its own line marks the next line as a bullet.
+            self.pending_bullet = self.pending_bullet or bullet
+            return
+        bullet = bullet or self.pending_bullet
+        self.pending_bullet = False
+
+        entries = self.resume.sections[-1].entries
+        if continues and not bullet and entries:
+            entries[-1].text = f"{entries[-1].text} {text}"
+            entries[-1].dates = tuple(m.group(0) for m in _DATE_RE.finditer(entries[-1].text))
+            return
+        entries.append(Entry(text=text, bullet=bullet, dates=tuple(m.group(0) for m in _DATE_RE.finditer(text))))
+
+    def build(self):
+        self._demote_empty_heading()
+        # Only the header can still be empty here; it holds no text.
+        self.resume.sections = [s for s in self.resume.sections if s.entries]
+        return self.resume
+
+
+def _pdf_lines(doc):
+    """Yields (text, size, bold, block_start) for each text line of the document."""
+    for page in doc:
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for i, line in enumerate(block["lines"]):
+                spans = [s for s in line["spans"] if s["text"].strip()]
+                if not spans:
+                    continue
+                text = " ".join(s["text"].strip() for s in spans)
+                size = max(s["size"] for s in spans)
+                bold = all(s["flags"] & _BOLD_FLAG for s in spans)
+                yield text, size, bold, i == 0
+
+
+@st.cache_data(show_spinner=False)
+def parse_resume_pdf(data: bytes):
+    """Parses PDF bytes into a `StructuredResume.to_dict()` payload, once per document."""
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        lines = list(_pdf_lines(doc))
+
+    sizes = Counter()
+    for text, size, _, _ in lines:
+        sizes[round(size, 1)] += len(text)
+    body_size = sizes.most_common(1)[0][0] if sizes else None
+
+    builder = _Builder()
+    for text, size, bold, block_start in lines:
+        if _looks_like_heading(text, size, body_size, bold):
+            builder.heading(text)
+        else:
+            builder.line(text, continues=not block_start)
+    return builder.build().to_dict()
+
+
+@st.cache_data(show_spinner=False, max_entries=256)  # the editor parses every settled draft
+def parse_resume_text(text: str):
+    """Plain-text counterpart of `parse_resume_pdf`, relying on heading keywords and capitals."""
+    builder = _Builder()
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if _looks_like_heading(line):
+            builder.heading(line)
+        else:
+            builder.line(line)
+    return builder.build().to_dict()
+
+
+def load_resume(uploaded_file):
+    """Parses an uploaded PDF/TXT resume into a `StructuredResume`."""
+    data = uploaded_file.getvalue()
+    if uploaded_file.type == "application/pdf":
+        return StructuredResume.from_dict(parse_resume_pdf(data))
+    return StructuredResume.from_dict(parse_resume_text(data.decode("utf-8")))
@@ -1,5 +1,10 @@
 import streamlit as st
 import google.generativeai as genai
+from modules.task_runner import DONE, FAILED, CANCELLED, generate_text, poll_task, submit_task
+
+def generate_roadmap(model, role, prompt):
+    """Worker-side call; the role travels with the result so a later run labels it correctly."""
+    return {"role": role, "roadmap": generate_text(model, prompt)}
 
 def career_roadmap():
     """Generates a 6-month learning roadmap for a given job role using Gemini AI."""
@@ -16,8 +21,7 @@ def career_roadmap():
     role = st.text_input("🎯 Target Job Role", placeholder="e.g., Cloud Engineer, Data Analyst, Product Designer")
 
     if st.button("🚀 Generate 6-Month Roadmap", use_container_width=True) and role:
-        with st.spinner(f"Crafting a powerful roadmap for {role}..."):
-            prompt = f"""
+        prompt = f"""
             You are a senior career mentor and expert planner.
 
             Create a detailed 6-month career roadmap for becoming a successful {role}. The roadmap must include:
@@ -30,10 +34,17 @@ def career_roadmap():
             Format the entire response in clear **markdown**.
             Keep it practical, modern, and achievable for someone learning independently.
             """
-            try:
-                result = model.generate_content(prompt).text
-                st.success(f"✅ Your 6-Month Roadmap for {role} is ready!")
-                st.download_button("💾 Download Roadmap (.md)", data=result, file_name=f"{role}_roadmap.md", mime="text/markdown")
-                st.markdown(result)
-            except Exception as e:
-                st.error("❌ Failed to generate roadmap. Please try again.")
+        submit_task("roadmap", prompt, generate_roadmap, model, role, prompt)
+
+    # --- Result (survives reruns and page switches) ---
+    task = poll_task("roadmap", label="Crafting your roadmap in the background...")
+    if task and task["status"] == DONE:
+        result = task["result"]["roadmap"]
+        result_role = task["result"]["role"]
+        st.success(f"✅ Your 6-Month Roadmap for {result_role} is ready!")
+        st.download_button("💾 Download Roadmap (.md)", data=result, file_name=f"{result_role}_roadmap.md", mime="text/markdown")
+        st.markdown(result)
+    elif task and task["status"] == FAILED:
+        st.error("❌ Failed to generate roadmap. Please try again.")
+    elif task and task["status"] == CANCELLED:
+        st.warning("✋ Roadmap generation cancelled.")
@@ -0,0 +1,201 @@
+# modules/session.py
+
+import base64
+import datetime
+import hashlib
+import hmac
+import json
+import secrets
+import time
+
+import requests
+import streamlit as st
+import streamlit.components.v1 as components
+from firebase_admin import auth as admin_auth
+
+from modules.task_runner import DONE, FINISHED_STATES, get_task_registry
+
+# --- Session settings ---
+TOKEN_URL = "https://securetoken.googleapis.com/v1/token"  # point at a local stand-in when testing
+COOKIE_NAME = "launchpad_session"
+COOKIE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+REFRESH_MARGIN_SECONDS = 10 * 60   # refresh in the background this long before expiry
+EXPIRY_SKEW_SECONDS = 30           # refresh inline if the token is (nearly) expired
+
+
+def _cookie_secret():
+    return st.secrets.get("SESSION_COOKIE_SECRET")
+
+
+def sign(value, secret):
+    mac = hmac.new(secret.encode("utf-8"), value.encode("utf-8"), hashlib.sha256).digest()
+    return f"{value}.{base64.urlsafe_b64encode(mac).decode('ascii').rstrip('=')}"
+
+
+def unsign(signed, secret):
+    """Returns the signed value, or None if the signature does not match."""
+    value, _, _ = signed.rpartition(".")
+    if not value or not hmac.compare_digest(sign(value, secret), signed):
+        return None
+    return value
+
+
+def verify_id_token(id_token):
+    """Verifies a Firebase ID token locally.
+
+    firebase_admin checks the signature against Google's public certificates,
+    which it caches for as long as their Cache-Control header allows, so this
+    normally makes no network call.
+    """
+    try:
+        return admin_auth.verify_id_token(id_token)
+    except Exception:
+        return None
+
+
+def refresh_id_token(api_key, refresh_token, token_url=None):
+    """Exchanges a refresh token for a new ID token, in pyrebase's user-dict shape.
+
+    `expiresAt` is stamped when the response arrives, so a result picked up on
+    a later run still carries the token's real expiry.
+    """
+    r = requests.post(f"{token_url or TOKEN_URL}?key={api_key}",
+                      data={"grant_type": "refresh_token", "refresh_token": refresh_token}, timeout=10)
+    r.raise_for_status()
+    data = r.json()
+    return {
+        "localId": data["user_id"],
+        "idToken": data["id_token"],
+        "refreshToken": data["refresh_token"],
+        "expiresIn": data["expires_in"],
+        "expiresAt": time.time() + int(data["expires_in"]),
+    }
+
+
+def _with_expiry(user, previous=None):
+    """Merges `user` over `previous`, stamping `expiresAt` only if `user` lacks one (a fresh sign-in)."""
+    merged = dict(previous or {}, **user)
+    if "expiresAt" not in user:
+        merged["expiresAt"] = time.time() + int(user.get("expiresIn", 3600))
+    return merged
+
+
+def _set_cookie(value, max_age):
+    # Written on the next run: callers usually st.rerun() straight away, which
+    # would drop a component rendered now.
+    st.session_state["pending_cookie"] = (value, max_age)
+
+
+def _flush_cookie():
+    # Streamlit can read cookies (st.context.cookies) but not set them, so do it from the page.
+    pending = st.session_state.pop("pending_cookie", None)
+    if pending:
+        value, max_age = pending
+        components.html(
+            f"<script>parent.document.cookie = {json.dumps(f'{COOKIE_NAME}={value}; Max-Age={max_age}; Path=/; SameSite=Strict; Secure')};</script>",
+            height=0,
+        )
+
+
+def begin_session(db, user):
+    """Stores a freshly signed-in pyrebase user and issues a signed session cookie."""
+    user = _with_expiry(user)
+    st.session_state["user"] = user
+
+    secret = _cookie_secret()
+    if not secret:
+        return user
+    session_id = secrets.token_urlsafe(32)
+    db.collection("sessions").document(session_id).set({
+        "uid": user["localId"],
+        "email": user.get("email"),
+        "refresh_token": user["refreshToken"],
+        "expires": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=COOKIE_MAX_AGE_SECONDS),
+    })
+    st.session_state["session_id"] = session_id
+    _set_cookie(sign(session_id, secret), COOKIE_MAX_AGE_SECONDS)
+    return user
+
+
+def _restore_from_cookie(db, api_key):
+    secret = _cookie_secret()
+    signed = st.context.cookies.get(COOKIE_NAME) if secret else None
+    session_id = unsign(signed, secret) if signed else None
+    if not session_id:
+        return None
+
+    doc = db.collection("sessions").document(session_id).get()
+    session = doc.to_dict() if doc.exists else None
+    if not session or session["expires"] < datetime.datetime.now(datetime.timezone.utc):
+        return None
+    try:
+        user = refresh_id_token(api_key, session["refresh_token"])
+    except Exception:
+        return None
+    if not verify_id_token(user["idToken"]):
+        return None
+
+    if user["refreshToken"] != session["refresh_token"]:
+        db.collection("sessions").document(session_id).update({"refresh_token": user["refreshToken"]})
+    st.session_state["session_id"] = session_id
+    return _with_expiry(user, {"email": session.get("email")})
+
+
+def ensure_session(db, api_key):
+    """Returns the signed-in user for this run, refreshing or restoring as needed.
+
+    Tokens close to expiry are refreshed on the shared task pool and picked up
+    on a later run; an expired token is refreshed inline. With no user in
+    session state, the session cookie (if any) is used to restore one.
+    """
+    _flush_cookie()
+    user = st.session_state.get("user")
+    if user is None:
+        # One attempt per browser session; a bad cookie shouldn't cost a read every run.
+        if st.session_state.get("session_restore_attempted"):
+            return None
+        st.session_state["session_restore_attempted"] = True
+        user = _restore_from_cookie(db, api_key)
+        if user:
+            st.session_state["user"] = user
+        return user
+
+    registry = get_task_registry()
+    task_id = st.session_state.get("auth_refresh_task_id")
+    if task_id:
+        task = registry.get(user["localId"], task_id)
+        if task and task["status"] == DONE:
+            user = _with_expiry(task["result"], user)
+            st.session_state["user"] = user
+        if task is None or task["status"] in FINISHED_STATES:
+            del st.session_state["auth_refresh_task_id"]
+
+    remaining = user.get("expiresAt", 0) - time.time()
+    if remaining < EXPIRY_SKEW_SECONDS:
+        try:
+            user = _with_expiry(refresh_id_token(api_key, user["refreshToken"]), user)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in (400, 401):
+                end_session(db)  # the refresh token was revoked or has expired
+            return None
+        except requests.RequestException:
+            return None  # network trouble; keep the session and retry next run
+        st.session_state["user"] = user
+    elif remaining < REFRESH_MARGIN_SECONDS and "auth_refresh_task_id" not in st.session_state:
+        # Keyed by the expiry being replaced: Firebase usually hands back the same
+        # refresh token, and a key on that alone would reuse an old finished refresh.
+        st.session_state["auth_refresh_task_id"] = registry.submit(
+            user["localId"], "auth_refresh", f"{user['refreshToken']}:{user['expiresAt']}",
+            refresh_id_token, api_key, user["refreshToken"]
+        )
+    return user
+
+
+def end_session(db):
+    """Signs out: drops the server-side session and clears the cookie and session state."""
+    session_id = st.session_state.get("session_id")
+    if session_id:
+        db.collection("sessions").document(session_id).delete()
+    st.session_state.clear()
+    if session_id:
+        _set_cookie("", 0)
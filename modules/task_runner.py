@@ -0,0 +1,186 @@
+# modules/task_runner.py
+
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+# --- Task settings ---
+MAX_WORKERS = 4
+PREFETCH_WORKERS = 1  # low-priority work gets its own small pool so it never delays page requests
+POLL_INTERVAL_SECONDS = 1.0
+RESULT_TTL_SECONDS = 60 * 60  # finished results are kept for an hour
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class TaskRegistry:
+    """Thread pool plus an in-process store of task status and results.
+
+    One registry is shared by every Streamlit session (see `get_task_registry`),
+    so a task keeps running and its result stays available across reruns,
+    page switches and new browser tabs of the same user.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="launchpad-task")
+        self._lock = threading.Lock()
+        self._tasks = {}
+
+    def submit(self, owner, kind, key, fn, *args, reuse_finished=True, **kwargs):
+        """Queues `fn(*args, **kwargs)` and returns its task ID.
+
+        The ID is derived from owner, kind and key, so submitting the same work
+        twice (e.g. after a rerun) returns the existing task instead of paying
+        for a second call. Failed or cancelled tasks are retried. Work with side
+        effects that must happen every time passes `reuse_finished=False`, so
+        only a task still in flight is shared.
+        """
+        task_id = make_task_id(owner, kind, key)
+        with self._lock:
+            self._purge_expired()
+            task = self._tasks.get(task_id)
+            if task and task["status"] in (PENDING, RUNNING):
+                return task_id
+            if task and task["status"] == DONE and reuse_finished:
+                return task_id
+
+            task = {
+                "id": task_id,
+                "owner": owner,
+                "kind": kind,
+                "status": PENDING,
+                "result": None,
+                "error": None,
+                "created": time.time(),
+                "finished": None,
+            }
+            self._tasks[task_id] = task
+            task["future"] = self._executor.submit(self._run, task, fn, args, kwargs)
+        return task_id
+
+    def _run(self, task, fn, args, kwargs):
+        with self._lock:
+            if task["status"] == CANCELLED:
+                return
+            task["status"] = RUNNING
+
+        try:
+            result, error, status = fn(*args, **kwargs), None, DONE
+        except Exception as e:
+            result, error, status = None, str(e), FAILED
+
+        with self._lock:
+            # A task cancelled while running finishes, but its result is dropped.
+            if task["status"] != CANCELLED:
+                task.update(status=status, result=result, error=error)
+            task["finished"] = time.time()
+
+    def get(self, owner, task_id):
+        """Returns a snapshot of the task, or None if unknown or not owned by `owner`."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if not task or task["owner"] != owner:
+                return None
+            return {k: v for k, v in task.items() if k != "future"}
+
+    def latest(self, owner, kind):
+        """Returns the most recently created task of `kind` for `owner`, if any."""
+        with self._lock:
+            tasks = [t for t in self._tasks.values() if t["owner"] == owner and t["kind"] == kind]
+            if not tasks:
+                return None
+            task = max(tasks, key=lambda t: t["created"])
+            return {k: v for k, v in task.items() if k != "future"}
+
+    def cancel(self, owner, task_id):
+        """Cancels a pending or running task. Returns True if it was still in flight."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if not task or task["owner"] != owner or task["status"] in FINISHED_STATES:
+                return False
+            task["future"].cancel()
+            task["status"] = CANCELLED
+            task["finished"] = time.time()
+            return True
+
+    def _purge_expired(self):
+        cutoff = time.time() - RESULT_TTL_SECONDS
+        expired = [tid for tid, t in self._tasks.items() if t["finished"] and t["finished"] < cutoff]
+        for tid in expired:
+            del self._tasks[tid]
+
+
+def make_task_id(owner, kind, key):
+    return hashlib.sha256(f"{owner}\x00{kind}\x00{key}".encode("utf-8")).hexdigest()[:32]
+
+
+@st.cache_resource
+def get_task_registry():
+    return TaskRegistry()
+
+
+@st.cache_resource
+def get_prefetch_registry():
+    return TaskRegistry(max_workers=PREFETCH_WORKERS)
+
+
+def task_owner():
+    """Logged-in users own tasks by uid; anonymous sessions get a per-session ID."""
+    user = st.session_state.get("user")
+    if user and user.get("localId"):
+        return user["localId"]
+    if "task_session_id" not in st.session_state:
+        st.session_state.task_session_id = f"session-{uuid.uuid4().hex}"
+    return st.session_state.task_session_id
+
+
+def generate_text(model, prompt):
+    """Worker-side Gemini call. Must not touch `st.*` — it runs off the script thread."""
+    return model.generate_content(prompt).text
+
+
+# --- Page helpers ---
+def submit_task(kind, key, fn, *args, **kwargs):
+    task_id = get_task_registry().submit(task_owner(), kind, key, fn, *args, **kwargs)
+    st.session_state[f"{kind}_task_id"] = task_id
+    return task_id
+
+
+def current_task(kind):
+    """The task this page last submitted, falling back to the user's latest one of that kind."""
+    registry = get_task_registry()
+    owner = task_owner()
+    task_id = st.session_state.get(f"{kind}_task_id")
+    if task_id:
+        task = registry.get(owner, task_id)
+        if task:
+            return task
+    return registry.latest(owner, kind)
+
+
+def poll_task(kind, label="Working on it..."):
+    """Renders the status of the page's current task and returns it once finished.
+
+    While the task is in flight this shows a cancel button and reruns the page
+    every `POLL_INTERVAL_SECONDS`, so it never returns in that case.
+    """
+    task = current_task(kind)
+    if task is None or task["status"] in FINISHED_STATES:
+        return task
+
+    st.info(f"⏳ {label}")
+    if st.button("✋ Cancel", key=f"cancel_{task['id']}"):
+        get_task_registry().cancel(task_owner(), task["id"])
+        st.rerun()
+    time.sleep(POLL_INTERVAL_SECONDS)
+    st.rerun()
@@ -0,0 +1,43 @@
+import pytest
+
+from modules.job_dedup import JobDeduplicator, choose_bands, dedupe_jobs, job_text
+
+POSTING = {
+    "title": "Backend Engineer",
+    "company": "Acme",
+    "description": "Build and operate Python services on AWS. Work with PostgreSQL, Redis and Kafka "
+                   "in a small team that ships to production several times a day.",
+}
+
+
+def _crossing(bands, rows):
+    return (1 / bands) ** (1 / rows)
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+def test_choose_bands_crosses_just_below_threshold(threshold):
+    bands, rows = choose_bands(128, threshold)
+    assert bands * rows == 128
+    assert _crossing(bands, rows) <= threshold
+
+
+def test_choose_bands_falls_back_to_most_bands():
+    assert choose_bands(128, 0.001) == (128, 1)
+
+
+@pytest.mark.parametrize("threshold", [0, -0.5, 1.01, 80])
+def test_out_of_range_threshold_is_rejected(threshold):
+    with pytest.raises(ValueError):
+        JobDeduplicator(threshold=threshold)
+
+
+def test_near_duplicate_postings_are_merged():
+    reposted = dict(POSTING, description=POSTING["description"] + " Apply now!")
+    other = dict(POSTING, title="Product Designer",
+                 description="Design clean user interfaces in Figma and run usability studies with customers.")
+
+    dedup = JobDeduplicator()
+    assert dedup.add(job_text(POSTING)) is None
+    assert dedup.add(job_text(reposted)) == 0
+    assert dedup.add(job_text(other)) is None
+    assert dedupe_jobs([POSTING, reposted, other]) == [POSTING, other]
@@ -0,0 +1,70 @@
+import fitz
+
+from modules.resume_parser import StructuredResume, parse_resume_pdf, parse_resume_text
+
+RESUME = """JANE DOE
+jane@example.com
+SKILLS
+AWS, GCP, SQL
+PYTHON
+EDUCATION
+MIT
+B.S. Computer Science 2015 - 2019
+"""
+
+
+def _parse(text):
+    return StructuredResume.from_dict(parse_resume_text(text))
+
+
+def _all_text(resume):
+    return [e.text for s in resume.sections for e in s.entries]
+
+
+def test_all_caps_lines_are_not_headings():
+    resume = _parse(RESUME)
+    assert [s.key for s in resume.sections] == ["header", "skills", "education"]
+    assert [e.text for e in resume.section("skills").entries] == ["AWS, GCP, SQL", "PYTHON"]
+    education = resume.section("education")
+    assert [e.text for e in education.entries] == ["MIT", "B.S. Computer Science 2015 - 2019"]
+    assert education.entries[1].dates == ("2015 - 2019",)
+
+
+def test_empty_heading_is_demoted_not_dropped():
+    resume = _parse("Jane Doe\nExperience\nSkills\nPython\nReferences\n")
+    assert [s.key for s in resume.sections] == ["header", "skills"]
+    assert _all_text(resume) == ["Jane Doe", "Experience", "Python", "References"]
+
+
+def test_ats_prompt_keeps_education_skills_and_custom_sections():
+    from modules.ats_cv_optimizer import ATS_SECTIONS
+
+    resume = StructuredResume.from_dict(parse_resume_pdf(_pdf([
+        ("Jane Doe", 20, False),
+        ("Skills", 14, True),
+        ("AWS, GCP, SQL", 10, False),
+        ("Open Source", 14, True),
+        ("Maintainer of a popular library", 10, False),
+        ("Education", 14, True),
+        ("MIT", 10, False),
+        ("Interests", 14, True),
+        ("Chess", 10, False),
+    ])))
+    assert [s.key for s in resume.sections] == ["header", "skills", "open_source", "education", "interests"]
+
+    prompt = resume.to_prompt_text(ATS_SECTIONS)
+    assert "AWS, GCP, SQL" in prompt
+    assert "Maintainer of a popular library" in prompt
+    assert "MIT" in prompt
+    assert "Chess" not in prompt
+    assert "Jane Doe" not in prompt
+
+
+def _pdf(lines):
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 50
+    for text, size, bold in lines:
+        page.insert_text((50, y), text, fontsize=size, fontname="hebo" if bold else "helv")
+        y += size + 12
+    return doc.tobytes()
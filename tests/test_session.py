@@ -0,0 +1,251 @@
+import datetime
+import json
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from modules import session
+from modules.task_runner import DONE, TaskRegistry
+
+SECRET = "test-secret"
+
+
+class _TokenHandler(BaseHTTPRequestHandler):
+    """Stand-in for securetoken.googleapis.com/v1/token."""
+
+    def do_POST(self):
+        body = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        self.server.requests.append({"query": parse_qs(urlparse(self.path).query), "body": body})
+        if body["refresh_token"] in (["revoked"], ["unavailable"]):
+            self.send_response(400 if body["refresh_token"] == ["revoked"] else 503)
+            self.end_headers()
+            return
+        self.server.issued += 1
+        payload = json.dumps({
+            "user_id": "uid-1",
+            "id_token": f"id-token-{self.server.issued}",
+            "refresh_token": body["refresh_token"][0],  # Firebase usually returns the same one
+            "expires_in": "3600",
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def token_server(monkeypatch):
+    server = HTTPServer(("127.0.0.1", 0), _TokenHandler)
+    server.requests = []
+    server.issued = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(session, "TOKEN_URL", f"http://127.0.0.1:{server.server_port}/v1/token")
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = TaskRegistry(max_workers=1)
+    monkeypatch.setattr(session, "get_task_registry", lambda: registry)
+    return registry
+
+
+@pytest.fixture
+def state(monkeypatch, registry):
+    """Stubs st.session_state, st.context, secrets and cookie rendering."""
+    session_state = {}
+    monkeypatch.setattr(session.st, "session_state", session_state)
+    monkeypatch.setattr(session.st, "context", types.SimpleNamespace(cookies={}))
+    monkeypatch.setattr(session, "_cookie_secret", lambda: SECRET)
+    monkeypatch.setattr(session.components, "html", lambda *a, **k: None)
+    return session_state
+
+
+class _Doc:
+    def __init__(self, store, key):
+        self.store, self.key = store, key
+
+    def get(self):
+        data = self.store.get(self.key)
+        return types.SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data))
+
+    def set(self, data):
+        self.store[self.key] = dict(data)
+
+    def update(self, data):
+        self.store[self.key].update(data)
+
+    def delete(self):
+        self.store.pop(self.key, None)
+
+
+class _FakeDb:
+    def __init__(self):
+        self.sessions = {}
+
+    def collection(self, name):
+        assert name == "sessions"
+        return types.SimpleNamespace(document=lambda key: _Doc(self.sessions, key))
+
+
+def _user(expires_in):
+    return {"localId": "uid-1", "email": "jane@example.com", "idToken": "old",
+            "refreshToken": "refresh-1", "expiresAt": time.time() + expires_in}
+
+
+def _wait(registry, owner, task_id):
+    for _ in range(200):
+        task = registry.get(owner, task_id)
+        if task["status"] == DONE:
+            return task
+        time.sleep(0.01)
+    raise AssertionError("refresh task did not finish")
+
+
+# --- sign / unsign ---
+def test_sign_round_trip():
+    assert session.unsign(session.sign("abc.def", SECRET), SECRET) == "abc.def"
+
+
+@pytest.mark.parametrize("tamper", [
+    lambda signed: "other" + signed[5:],
+    lambda signed: signed[:-2] + ("AA" if not signed.endswith("AA") else "BB"),
+    lambda signed: signed.rpartition(".")[0],
+    lambda signed: "",
+])
+def test_unsign_rejects_tampering(tamper):
+    assert session.unsign(tamper(session.sign("session-id", SECRET)), SECRET) is None
+
+
+def test_unsign_rejects_other_secret():
+    assert session.unsign(session.sign("session-id", SECRET), "other-secret") is None
+
+
+# --- refresh_id_token against the stand-in ---
+def test_refresh_id_token_uses_token_endpoint(token_server):
+    before = time.time()
+    user = session.refresh_id_token("api-key", "refresh-1")
+
+    assert token_server.requests == [{
+        "query": {"key": ["api-key"]},
+        "body": {"grant_type": ["refresh_token"], "refresh_token": ["refresh-1"]},
+    }]
+    assert user["localId"] == "uid-1"
+    assert user["idToken"] == "id-token-1"
+    assert before + 3600 <= user["expiresAt"] <= time.time() + 3600
+
+
+# --- ensure_session ---
+def test_fresh_token_is_left_alone(token_server, state):
+    state["user"] = _user(3000)
+    assert session.ensure_session(_FakeDb(), "api-key") is state["user"]
+    assert token_server.requests == []
+    assert "auth_refresh_task_id" not in state
+
+
+def test_expired_token_is_refreshed_inline(token_server, state):
+    state["user"] = _user(-5)
+    user = session.ensure_session(_FakeDb(), "api-key")
+
+    assert user["idToken"] == "id-token-1"
+    assert user["email"] == "jane@example.com"
+    assert user["expiresAt"] > time.time() + 3500
+    assert state["user"] is user
+
+
+def test_failed_inline_refresh_ends_session(token_server, state):
+    state["user"] = dict(_user(-5), refreshToken="revoked")
+    assert session.ensure_session(_FakeDb(), "api-key") is None
+    assert "user" not in state
+
+
+def test_failed_inline_refresh_deletes_server_session(token_server, state):
+    db = _FakeDb()
+    db.sessions["sid-1"] = {"uid": "uid-1"}
+    state.update(user=dict(_user(-5), refreshToken="revoked"), session_id="sid-1")
+    assert session.ensure_session(db, "api-key") is None
+    assert db.sessions == {}
+
+
+def test_token_endpoint_outage_keeps_session(token_server, state):
+    db = _FakeDb()
+    db.sessions["sid-1"] = {"uid": "uid-1"}
+    state.update(user=dict(_user(-5), refreshToken="unavailable"), session_id="sid-1")
+
+    assert session.ensure_session(db, "api-key") is None
+    assert "sid-1" in db.sessions
+    assert state["user"]["refreshToken"] == "unavailable"  # retried on the next run
+
+
+def test_unreachable_token_endpoint_keeps_session(token_server, state, monkeypatch):
+    monkeypatch.setattr(session, "TOKEN_URL", "http://127.0.0.1:1/v1/token")
+    db = _FakeDb()
+    db.sessions["sid-1"] = {"uid": "uid-1"}
+    state.update(user=_user(-5), session_id="sid-1")
+
+    assert session.ensure_session(db, "api-key") is None
+    assert "sid-1" in db.sessions
+    assert "user" in state
+
+
+def test_near_expiry_refreshes_in_background(token_server, state, registry):
+    state["user"] = _user(60)
+
+    session.ensure_session(_FakeDb(), "api-key")
+    task = _wait(registry, "uid-1", state["auth_refresh_task_id"])
+    worker_expiry = task["result"]["expiresAt"]
+
+    time.sleep(0.05)  # a later run picks the result up
+    user = session.ensure_session(_FakeDb(), "api-key")
+    assert user["idToken"] == "id-token-1"
+    assert user["expiresAt"] == worker_expiry  # stamped by the worker, not at pickup
+    assert "auth_refresh_task_id" not in state
+
+
+def test_second_background_refresh_is_not_served_from_the_first(token_server, state, registry):
+    state["user"] = _user(60)
+    session.ensure_session(_FakeDb(), "api-key")
+    _wait(registry, "uid-1", state["auth_refresh_task_id"])
+    session.ensure_session(_FakeDb(), "api-key")
+
+    # An hour later the same refresh token is close to expiry again.
+    state["user"]["expiresAt"] = time.time() + 60
+    session.ensure_session(_FakeDb(), "api-key")
+    _wait(registry, "uid-1", state["auth_refresh_task_id"])
+    user = session.ensure_session(_FakeDb(), "api-key")
+
+    assert len(token_server.requests) == 2
+    assert user["idToken"] == "id-token-2"
+    assert user["expiresAt"] > time.time() + 3500
+
+
+def test_session_is_restored_from_signed_cookie(token_server, state, monkeypatch):
+    db = _FakeDb()
+    db.sessions["sid-1"] = {
+        "uid": "uid-1",
+        "email": "jane@example.com",
+        "refresh_token": "refresh-1",
+        "expires": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1),
+    }
+    session.st.context.cookies[session.COOKIE_NAME] = session.sign("sid-1", SECRET)
+    monkeypatch.setattr(session, "verify_id_token", lambda token: {"uid": "uid-1"})
+
+    user = session.ensure_session(db, "api-key")
+    assert user["idToken"] == "id-token-1"
+    assert user["email"] == "jane@example.com"
+    assert state["session_id"] == "sid-1"
+
+
+def test_forged_cookie_is_ignored(token_server, state):
+    session.st.context.cookies[session.COOKIE_NAME] = session.sign("sid-1", "attacker")
+    assert session.ensure_session(_FakeDb(), "api-key") is None
+    assert token_server.requests == []